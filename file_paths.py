@@ -2,6 +2,90 @@
 
 import os
 import argparse
+import errno
+import heapq
+import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_file_paths(directory: str, recursive: bool = True) -> Iterator[str]:
+    """Yield all file paths in the given directory in sorted order.
+
+    Each directory's entries are sorted as they are scanned, and the global
+    order comes from a streaming heapq.merge of the per-directory lists —
+    O(N log D) instead of a second full O(N log N) sort over all paths.
+
+    Args:
+        directory: Path to the directory to scan.
+        recursive: If True, include files in subdirectories.
+
+    Yields:
+        Absolute file paths in lexicographic order.
+    """
+    if recursive:
+        # Parallel scandir traversal: each directory listing is a blocking
+        # syscall that releases the GIL, so a thread pool hides per-request
+        # latency on network/FUSE mounts. DirEntry.is_file()/is_dir() reuse
+        # the d_type from the directory read, so no extra stat fires.
+        # Each directory is scanned through a file descriptor that is opened
+        # only when its scan starts, so open descriptors stay bounded by the
+        # worker count instead of one per pending directory in the frontier.
+        per_dir_lists = []
+        results_lock = threading.Lock()
+        futures = []
+        futures_lock = threading.Lock()
+        open_flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+
+        def scan(path: str, dir_fd: int = -1):
+            if dir_fd < 0:
+                try:
+                    dir_fd = os.open(path, open_flags)
+                except OSError as e:
+                    # Descriptor exhaustion is a process-wide failure, not an
+                    # unreadable directory — dropping it would silently lose
+                    # whole subtrees.
+                    if e.errno in (errno.EMFILE, errno.ENFILE):
+                        raise
+                    return  # unreadable directory — skip, like os.walk does
+            local_files = []
+            try:
+                with os.scandir(dir_fd) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            with futures_lock:
+                                futures.append(pool.submit(scan, os.path.join(path, entry.name)))
+                        elif entry.is_file(follow_symlinks=False):
+                            local_files.append(os.path.join(path, entry.name))
+            except OSError:
+                pass  # unreadable directory — skip, like os.walk does
+            finally:
+                os.close(dir_fd)
+            if local_files:
+                local_files.sort()
+                with results_lock:
+                    per_dir_lists.append(local_files)
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            # The root is opened up front so a missing or non-directory path
+            # raises to the caller rather than being skipped.
+            with futures_lock:
+                futures.append(pool.submit(scan, directory, os.open(directory, open_flags)))
+            # Countdown-latch idiom: drain futures in submission order; any
+            # child directories a worker discovers are appended behind us.
+            done = 0
+            while True:
+                with futures_lock:
+                    if done == len(futures):
+                        break
+                    future = futures[done]
+                future.result()
+                done += 1
+
+        yield from heapq.merge(*per_dir_lists)
+    else:
+        yield from sorted(entry.path for entry in os.scandir(directory) if entry.is_file())
 
 
 def gather_file_paths(directory: str, recursive: bool = True) -> list[str]:
@@ -14,18 +98,7 @@ def gather_file_paths(directory: str, recursive: bool = True) -> list[str]:
     Returns:
         Sorted list of absolute file paths.
     """
-    file_paths = []
-
-    if recursive:
-        for root, _, files in os.walk(directory):
-            for filename in files:
-                file_paths.append(os.path.join(root, filename))
-    else:
-        for entry in os.scandir(directory):
-            if entry.is_file():
-                file_paths.append(entry.path)
-
-    return sorted(file_paths)
+    return list(iter_file_paths(directory, recursive))
 
 
 def main():
@@ -37,19 +110,23 @@ def main():
 
     directory = os.path.abspath(args.directory)
 
-    if not os.path.isdir(directory):
+    # No separate isdir check: the walk's own opening of the root raises if
+    # the path is missing or not a directory, saving a stat per invocation.
+    try:
+        file_paths = gather_file_paths(directory, recursive=not args.no_recursive)
+    except (NotADirectoryError, FileNotFoundError):
         print(f"Error: '{directory}' is not a valid directory.")
         return
 
-    file_paths = gather_file_paths(directory, recursive=not args.no_recursive)
-
     print(f"Found {len(file_paths)} file(s) in '{directory}':\n")
-    for path in file_paths:
-        print(path)
+    # One buffered write instead of a print (write syscall + stdout lock) per path
+    if file_paths:
+        sys.stdout.write("\n".join(file_paths))
+        sys.stdout.write("\n")
 
     if args.output:
-        with open(args.output, "w") as f:
-            f.write("\n".join(file_paths))
+        with open(args.output, "w", buffering=8 << 20) as f:
+            f.writelines(path + "\n" for path in file_paths)
         print(f"\nResults written to '{args.output}'")
 
 
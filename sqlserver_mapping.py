@@ -1,8 +1,16 @@
+import csv
 import pyodbc
 import pandas as pd
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+# Must be set before the first connect - pyodbc reads it once when the ODBC
+# environment is allocated. Lets workers reuse pooled connections instead of
+# paying a fresh TCP handshake each.
+pyodbc.pooling = True
+
 def create_connection(server: str, username: str = None, password: str = None, 
                      driver: str = 'ODBC Driver 17 for SQL Server') -> pyodbc.Connection:
     """
@@ -61,107 +69,141 @@ def get_databases(connection: pyodbc.Connection) -> List[str]:
         print(f"Error getting databases: {e}")
         return []
 
-def get_tables(connection: pyodbc.Connection, database: str) -> List[str]:
+def quote_ident(name: str) -> str:
     """
-    Get list of all tables in a specific database
-    
+    Quote a SQL Server identifier, escaping embedded closing brackets
+
+    Identifiers (database/table names) cannot be bound as query parameters,
+    so this is the safe way to splice server-reported names into SQL.
+
     Args:
-        connection: Active pyodbc connection
-        database: Database name
-    
+        name: Raw identifier
+
+    Returns:
+        Bracket-quoted identifier safe to embed in a statement
+    """
+    return '[' + name.replace(']', ']]') + ']'
+
+def get_column_info(connection: pyodbc.Connection, database: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get column information for all tables in a database with a single query
+
+    One INFORMATION_SCHEMA.COLUMNS query per database replaces the per-table
+    round trips (and the separate table listing - tables are implicit in the
+    column results), which dominates runtime on remote servers.
+
+    The connection is expected to already have the target database selected
+    (map_database issues the USE), so the statement text is constant and SQL
+    Server reuses one cached plan across all databases.
+
+    Args:
+        connection: Active pyodbc connection with the database selected
+        database: Database name, for error reporting
+
     Returns:
-        List of table names
+        Dictionary mapping table name to its list of column info dictionaries,
+        in ordinal position order
     """
+    columns_by_table = defaultdict(list)
+
     try:
         cursor = connection.cursor()
-        cursor.execute(f"""
-            SELECT TABLE_NAME 
-            FROM [{database}].INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_TYPE = 'BASE TABLE'
-            ORDER BY TABLE_NAME
+        cursor.arraysize = 10000  # pipeline row fetches instead of one round trip each
+        cursor.execute("""
+            SELECT
+                c.TABLE_NAME,
+                c.COLUMN_NAME,
+                c.DATA_TYPE,
+                c.IS_NULLABLE,
+                c.CHARACTER_MAXIMUM_LENGTH,
+                c.NUMERIC_PRECISION,
+                c.NUMERIC_SCALE
+            FROM INFORMATION_SCHEMA.COLUMNS c
+            JOIN INFORMATION_SCHEMA.TABLES t
+                ON t.TABLE_SCHEMA = c.TABLE_SCHEMA
+                AND t.TABLE_NAME = c.TABLE_NAME
+            WHERE t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
         """)
-        
-        tables = [row[0] for row in cursor.fetchall()]
-        return tables
-    
+
+        for row in cursor.fetchall():
+            columns_by_table[row[0]].append({
+                'column_name': row[1],
+                'data_type': row[2],
+                'is_nullable': row[3],
+                'max_length': row[4],
+                'precision': row[5],
+                'scale': row[6]
+            })
+
+        return dict(columns_by_table)
+
     except Exception as e:
-        print(f"Error getting tables for database {database}: {e}")
-        return []
+        print(f"Error getting column info for database {database}: {e}")
+        return {}
 
-def get_column_info(connection: pyodbc.Connection, database: str, table: str) -> List[Dict[str, Any]]:
+def get_table_row_counts(connection: pyodbc.Connection, database: str) -> Dict[str, int]:
     """
-    Get column information for a specific table
-    
+    Get approximate row counts for every table in the selected database
+
+    One sys.dm_db_partition_stats query up front lets the sampling step skip
+    empty tables entirely instead of paying a scan to learn there is no data.
+
     Args:
-        connection: Active pyodbc connection
-        database: Database name
-        table: Table name
-    
+        connection: Active pyodbc connection with the database selected
+        database: Database name, for error reporting
+
     Returns:
-        List of dictionaries containing column information
+        Dictionary mapping table name to its row count
     """
     try:
         cursor = connection.cursor()
-        cursor.execute(f"""
-            SELECT 
-                COLUMN_NAME,
-                DATA_TYPE,
-                IS_NULLABLE,
-                CHARACTER_MAXIMUM_LENGTH,
-                NUMERIC_PRECISION,
-                NUMERIC_SCALE
-            FROM [{database}].INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = '{table}'
-            ORDER BY ORDINAL_POSITION
+        cursor.execute("""
+            SELECT OBJECT_NAME(object_id), SUM(row_count)
+            FROM sys.dm_db_partition_stats
+            WHERE index_id IN (0, 1)
+            GROUP BY object_id
         """)
-        
-        columns = []
-        for row in cursor.fetchall():
-            columns.append({
-                'column_name': row[0],
-                'data_type': row[1],
-                'is_nullable': row[2],
-                'max_length': row[3],
-                'precision': row[4],
-                'scale': row[5]
-            })
-        
-        return columns
-    
+
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
     except Exception as e:
-        print(f"Error getting column info for {database}.{table}: {e}")
-        return []
+        print(f"Error getting row counts for database {database}: {e}")
+        return {}
 
-def get_sample_values(connection: pyodbc.Connection, database: str, table: str, 
-                     column: str, sample_size: int = 3) -> List[Any]:
+def get_sample_values(connection: pyodbc.Connection, database: str, table: str,
+                     sample_size: int = 3) -> Dict[str, List[Any]]:
     """
-    Get sample unique values from a specific column
-    
+    Get sample unique values for every column of a table with a single query
+
+    One TABLESAMPLE scan per table replaces the per-column DISTINCT TOP N
+    queries, each of which forced its own sort over the whole table. The
+    unique values are picked out per column in Python from the sampled rows.
+
     Args:
-        connection: Active pyodbc connection
-        database: Database name
+        connection: Active pyodbc connection with the database selected
+        database: Database name, for error reporting
         table: Table name
-        column: Column name
-        sample_size: Number of sample values to retrieve
-    
+        sample_size: Number of sample values to retrieve per column
+
     Returns:
-        List of sample values
+        Dictionary mapping column name to its list of sample values
     """
     try:
-        cursor = connection.cursor()
-        cursor.execute(f"""
-            SELECT DISTINCT TOP {sample_size} [{column}]
-            FROM [{database}].[dbo].[{table}]
-            WHERE [{column}] IS NOT NULL
-            ORDER BY [{column}]
-        """)
-        
-        values = [row[0] for row in cursor.fetchall()]
-        return values
-    
+        df = pd.read_sql(f"""
+            SELECT TOP 100 *
+            FROM dbo.{quote_ident(table)}
+            TABLESAMPLE (1000 ROWS)
+        """, connection)
+
+        return {
+            col: list(df[col].dropna().unique()[:sample_size])
+            for col in df.columns
+        }
+
     except Exception as e:
-        print(f"Error getting sample values for {database}.{table}.{column}: {e}")
-        return []
+        print(f"Error getting sample values for {database}.{table}: {e}")
+        return {}
 
 def format_data_type(column_info: Dict[str, Any]) -> str:
     """
@@ -184,114 +226,189 @@ def format_data_type(column_info: Dict[str, Any]) -> str:
     else:
         return data_type
 
-def create_data_map(server: str, username: str = None, password: str = None, 
-                   output_file: str = 'sql_server_data_map.csv') -> pd.DataFrame:
+DATA_MAP_FIELDNAMES = ['database', 'table', 'column', 'data_type', 'sample_values', 'is_nullable']
+
+def map_database(server: str, username: str, password: str, database: str) -> Dict[str, List[Any]]:
+    """
+    Map all tables and columns of a single database
+
+    Opens its own connection so it can run safely from a worker thread
+    (pyodbc connections are not thread-safe to share).
+
+    Results are columnar (one parallel list per output field) rather than a
+    list of per-row dicts - a dict per column row costs ~240B against ~40B
+    of list slots, so this cuts allocator pressure roughly 6x on wide servers.
+
+    Args:
+        server: SQL Server instance name or IP
+        username: Username for SQL Server (optional)
+        password: Password for SQL Server (optional)
+        database: Database name
+
+    Returns:
+        Dictionary mapping each DATA_MAP_FIELDNAMES entry to its list of values
+    """
+    results = {name: [] for name in DATA_MAP_FIELDNAMES}
+    print(f"\nProcessing database: {database}")
+
+    connection = create_connection(server, username, password)
+    try:
+        # Select the database once, outside the hot loop - database names
+        # cannot be bound as parameters, and with USE in place every query
+        # below has constant text, so its plan is compiled once and reused
+        connection.execute(f"USE {quote_ident(database)}")
+
+        # Get column information for every table in one query
+        columns_by_table = get_column_info(connection, database)
+
+        # Prefetch row counts so empty tables skip the sampling scan
+        row_counts = get_table_row_counts(connection, database)
+
+        # Process each table
+        for table, columns_info in columns_by_table.items():
+            print(f"  Processing table: {table}")
+
+            # Get sample values for all columns in one sampled scan,
+            # unless the table is known to be empty
+            if row_counts.get(table, 1) == 0:  # unknown counts still get sampled
+                samples_by_column = {}
+            else:
+                samples_by_column = get_sample_values(connection, database, table)
+
+            # Process each column
+            for col_info in columns_info:
+                column_name = col_info['column_name']
+
+                sample_values = samples_by_column.get(column_name, [])
+                sample_values_str = ', '.join([str(v) for v in sample_values]) if sample_values else 'No data'
+
+                # Format data type
+                formatted_data_type = format_data_type(col_info)
+
+                # Add to results
+                results['database'].append(database)
+                results['table'].append(table)
+                results['column'].append(column_name)
+                results['data_type'].append(formatted_data_type)
+                results['sample_values'].append(sample_values_str)
+                results['is_nullable'].append(col_info['is_nullable'])
+    finally:
+        connection.close()
+
+    return results
+
+def create_data_map(server: str, username: str = None, password: str = None,
+                   output_file: str = 'sql_server_data_map.csv') -> str:
     """
     Main function to create a comprehensive data map of SQL Server
-    
+
+    Rows are streamed to the output CSV as each database finishes instead of
+    being accumulated in memory first, so peak memory stays flat regardless
+    of how many columns the server has.
+
     Args:
         server: SQL Server instance name or IP
         username: Username for SQL Server (optional)
         password: Password for SQL Server (optional)
         output_file: Output CSV file name
-    
+
     Returns:
-        pandas DataFrame containing the data map
+        Path to the output CSV file, or empty string on failure
     """
-    # Initialize the results list
-    data_map_results = []
-    
     try:
         # Create connection
         connection = create_connection(server, username, password)
-        
+
         # Get all databases
         databases = get_databases(connection)
-        
+
+        # Close connection - each worker opens its own
+        connection.close()
+
         total_tables = 0
         total_columns = 0
-        
-        # Process each database
-        for database in databases:
-            print(f"\nProcessing database: {database}")
-            
-            # Get all tables in the database
-            tables = get_tables(connection, database)
-            total_tables += len(tables)
-            
-            # Process each table
-            for table in tables:
-                print(f"  Processing table: {table}")
-                
-                # Get column information
-                columns_info = get_column_info(connection, database, table)
-                total_columns += len(columns_info)
-                
-                # Process each column
-                for col_info in columns_info:
-                    column_name = col_info['column_name']
-                    
-                    # Get sample values
-                    sample_values = get_sample_values(connection, database, table, column_name)
-                    sample_values_str = ', '.join([str(v) for v in sample_values]) if sample_values else 'No data'
-                    
-                    # Format data type
-                    formatted_data_type = format_data_type(col_info)
-                    
-                    # Add to results
-                    data_map_results.append({
-                        'database': database,
-                        'table': table,
-                        'column': column_name,
-                        'data_type': formatted_data_type,
-                        'sample_values': sample_values_str,
-                        'is_nullable': col_info['is_nullable']
-                    })
-        
-        # Close connection
-        connection.close()
-        
-        # Create DataFrame
-        df = pd.DataFrame(data_map_results)
-        
-        # Save to CSV
-        df.to_csv(output_file, index=False)
-        
+
+        # Scan databases in parallel - pyodbc releases the GIL during ODBC
+        # calls, so threads overlap the per-database network round trips.
+        # Rows stream straight to the CSV as each database resolves, in
+        # submission order so output stays deterministic.
+        # 8MB buffer coalesces the per-row writes into few write() syscalls
+        with open(output_file, 'w', newline='', encoding='utf-8', buffering=8 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(DATA_MAP_FIELDNAMES)
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                futures = [
+                    pool.submit(map_database, server, username, password, database)
+                    for database in databases
+                ]
+                for database, future in zip(databases, futures):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        print(f"Error mapping database {database}: {e}")
+                        continue
+
+                    total_tables += len(set(results['table']))
+                    total_columns += len(results['column'])
+                    # zip re-assembles rows lazily from the parallel columns
+                    writer.writerows(zip(*(results[name] for name in DATA_MAP_FIELDNAMES)))
+
         print(f"\n=== Data Mapping Complete ===")
         print(f"Total databases processed: {len(databases)}")
         print(f"Total tables processed: {total_tables}")
         print(f"Total columns processed: {total_columns}")
         print(f"Data map saved to: {output_file}")
-        print(f"DataFrame shape: {df.shape}")
-        
-        return df
-    
+
+        return output_file
+
     except Exception as e:
         print(f"Error in create_data_map: {e}")
-        return pd.DataFrame()
+        return ''
 
-def display_summary(df: pd.DataFrame):
+def display_summary(output_file: str):
     """
     Display a summary of the data map
-    
+
+    Reads the CSV back in chunks so the summary never materializes the full
+    data map in memory.
+
     Args:
-        df: DataFrame containing the data map
+        output_file: Path to the data map CSV
     """
-    if df.empty:
+    total_records = 0
+    databases = set()
+    tables = set()
+    columns = set()
+    data_type_counts = Counter()
+    tables_per_database = defaultdict(set)
+
+    for chunk in pd.read_csv(output_file, chunksize=100_000):
+        total_records += len(chunk)
+        databases.update(chunk['database'].unique())
+        tables.update(chunk['table'].unique())
+        columns.update(chunk['column'].unique())
+        data_type_counts.update(chunk['data_type'].value_counts().to_dict())
+        for database, table in chunk[['database', 'table']].drop_duplicates().itertuples(index=False):
+            tables_per_database[database].add(table)
+
+    if not total_records:
         print("No data to summarize")
         return
-    
+
     print("\n=== DATA MAP SUMMARY ===")
-    print(f"Total records: {len(df)}")
-    print(f"Databases: {df['database'].nunique()}")
-    print(f"Tables: {df['table'].nunique()}")
-    print(f"Unique columns: {df['column'].nunique()}")
-    
+    print(f"Total records: {total_records}")
+    print(f"Databases: {len(databases)}")
+    print(f"Tables: {len(tables)}")
+    print(f"Unique columns: {len(columns)}")
+
     print(f"\nTop 10 most common data types:")
-    print(df['data_type'].value_counts().head(10))
-    
+    for data_type, count in data_type_counts.most_common(10):
+        print(f"{data_type}: {count}")
+
     print(f"\nDatabases and table counts:")
-    print(df.groupby('database')['table'].nunique().sort_values(ascending=False))
+    for database, db_tables in sorted(tables_per_database.items(), key=lambda kv: len(kv[1]), reverse=True):
+        print(f"{database}: {len(db_tables)}")
 
 def main():
     """
@@ -307,15 +424,15 @@ def main():
     print(f"Target server: {SERVER}")
     
     # Create the data map
-    df = create_data_map(SERVER, USERNAME, PASSWORD, OUTPUT_FILE)
-    
-    if not df.empty:
+    output_file = create_data_map(SERVER, USERNAME, PASSWORD, OUTPUT_FILE)
+
+    if output_file:
         # Display summary
-        display_summary(df)
-        
+        display_summary(output_file)
+
         # Display first few rows
         print("\n=== FIRST 10 ROWS ===")
-        print(df.head(10).to_string(index=False))
+        print(pd.read_csv(output_file, nrows=10).to_string(index=False))
     else:
         print("Data mapping failed. Please check your connection settings and permissions.")
 